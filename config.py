@@ -17,6 +17,7 @@ DATA_DIR.mkdir(parents=True, exist_ok=True)
 # Promotion order: dev → qa → staging → prod
 # Migration can only happen in this sequence (no skipping allowed)
 ENVIRONMENTS = ["dev", "qa", "staging", "prod"]
+ENVIRONMENTS_SET = frozenset(ENVIRONMENTS)   # O(1) membership checks
 
 ENVIRONMENT_TRANSITIONS = {
     "dev":     "qa",
@@ -34,18 +35,25 @@ DOMAINS = [
     "general",       # General purpose prompts
     "shared"         # Cross-cutting: safety guardrails, tone guidelines
 ]
+DOMAINS_SET = frozenset(DOMAINS)
 
 # ─── Agent Types ─────────────────────────────────────────────────────────────
 # Three source systems from which prompts are ingested
 AGENT_TYPES = ["dfcx", "adk", "custom"]
+AGENT_TYPES_SET = frozenset(AGENT_TYPES)
 
 # ─── Registry File ───────────────────────────────────────────────────────────
 # This JSON file acts as our local prompt registry
 # In real GCP: this maps to Vertex AI Prompt Management API
 REGISTRY_FILE = DATA_DIR / "prompt_registry.json"
+REGISTRY_FILE_STR = str(REGISTRY_FILE)   # for open()/stat() and cache keys
 
-# Manifest file stores migration history
-MANIFEST_FILE = DATA_DIR / "migration_manifest.json"
+# Manifest file stores migration history - append-only JSON Lines,
+# one migration entry per line
+MANIFEST_FILE = DATA_DIR / "migration_manifest.jsonl"
+MANIFEST_FILE_STR = str(MANIFEST_FILE)
+# Pre-JSONL manifest ({"migrations": [...]}) - converted on first use, kept
+LEGACY_MANIFEST_FILE = DATA_DIR / "migration_manifest.json"
 
 # ─── Operator Identity ───────────────────────────────────────────────────────
 # Used in migration manifests to track who performed the migration
@@ -0,0 +1,84 @@
+# src/cli/demo.py
+# End-to-end demo of all PoC acceptance criteria (AC1 - AC5)
+# Loaded by main.py only when --demo is passed
+
+import sys
+
+from src.ingestion.ingest_all import ingest_all
+from src.utils.filter import list_all_prompts, filter_by_environment
+from src.migration.migrate import MigrationEngine
+from src.utils.versioning import show_version_history, rollback_demo
+from src.registry.store import PromptRegistry
+
+
+def print_header(title: str):
+    hashes = "#" * 65
+    sys.stdout.write(f"\n{hashes}\n#  {title}\n{hashes}\n")
+
+
+def run_full_demo(prompt_id: str):
+    """
+    Full end-to-end demo of all PoC capabilities.
+    Now takes prompt_id dynamically instead of hardcoding.
+    """
+    # One registry + engine for the whole demo, so each step reuses the
+    # already-parsed registry instead of loading it again
+    registry = PromptRegistry()
+    engine = MigrationEngine(registry=registry)
+
+    # ── AC1: Multi-source Ingestion ───────────────────────────────────────────
+    print_header("AC1: MULTI-SOURCE PROMPT INGESTION (DFCX + ADK + CUSTOM)")
+    ingest_all(registry)
+
+    # ── AC2: List all prompts with metadata ───────────────────────────────────
+    print_header("AC2: ALL PROMPTS WITH FULL METADATA")
+    list_all_prompts()
+
+    # ── AC3: Domain & Environment filtering ───────────────────────────────────
+    print_header("AC3: FILTERING DEMO")
+    filter_by_environment("dev")
+
+    # ── AC4: Migration dev → qa ───────────────────────────────────────────────
+    print_header(f"AC4: MIGRATION CLI - DEV → QA (For ID: {prompt_id})")
+
+    print("\n--- Dry Run First ---")
+    try:
+        engine.migrate(prompt_id=prompt_id, dry_run=True)
+        
+        print("\n--- Actual Migration ---")
+        engine.migrate(prompt_id=prompt_id, dry_run=False)
+    except Exception as e:
+        print(f"\n❌ MIGRATION ERROR: {e}")
+
+    print("\n--- Migration History ---")
+    engine.show_manifest()
+
+    # ── AC5: Versioning & Rollback ────────────────────────────────────────────
+    print_header(f"AC5: VERSIONING AND ROLLBACK (For ID: {prompt_id})")
+
+    print("\n--- Current Version History ---")
+    try:
+        show_version_history(prompt_id, registry)
+
+        print("\n--- Adding New Version (Automated Update) ---")
+        registry.update_prompt(
+            prompt_id=prompt_id,
+            system_instructions="[UPDATED DEMO] You are an upgraded assistant with enhanced capabilities.",
+            template="[UPDATED DEMO] Issue: {issue_type} | Account: {account_id}",
+            change_note="Automated version update for Demo"
+        )
+
+        print("\n--- Version History After Update ---")
+        show_version_history(prompt_id, registry)
+
+        print("\n--- Rollback to v1 ---")
+        rollback_demo(prompt_id, target_version=1, registry=registry)
+
+        print("\n--- Final Version History (Rollback as new version) ---")
+        show_version_history(prompt_id, registry)
+        
+    except Exception as e:
+        print(f"\n❌ VERSIONING ERROR: {e}")
+
+    # ── Summary ───────────────────────────────────────────────────────────────
+    print_header("POC COMPLETE - ALL ACCEPTANCE CRITERIA DEMONSTRATED")
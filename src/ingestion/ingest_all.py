@@ -1,35 +1,64 @@
 # src/ingestion/ingest_all.py
-# Master ingestor - runs all three ingestors in sequence
+# Master ingestor - extracts from all three agent sources concurrently,
+# then writes everything to the registry in a single bulk save
 # Single entry point to populate the registry from all agent sources
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-sys.path.append(str(Path(__file__).parent.parent.parent))
+from typing import Optional
+
+if __name__ == "__main__":
+    # Direct script run - make the project root importable.
+    # Prefer package-style runs instead: python -m src.ingestion.ingest_all
+    sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.registry.store import PromptRegistry
+from src.ingestion.dfcx_ingestor import get_dfcx_sample_prompts
+from src.ingestion.adk_ingestor import get_adk_sample_prompts
+from src.ingestion.custom_ingestor import get_custom_sample_prompts
 
-from src.ingestion.dfcx_ingestor import ingest_dfcx_prompts
-from src.ingestion.adk_ingestor import ingest_adk_prompts
-from src.ingestion.custom_ingestor import ingest_custom_prompts
 
+# (agent_type, extractor) per source - extractors are independent of each other
+_SOURCES = (
+    ("dfcx",   get_dfcx_sample_prompts),
+    ("adk",    get_adk_sample_prompts),
+    ("custom", get_custom_sample_prompts),
+)
 
-def ingest_all():
-    print("=" * 60)
-    print("  VERTEX AI PROMPT MANAGEMENT - BULK INGESTION")
-    print("=" * 60)
 
-    print("\n[1/3] Ingesting DFCX prompts...")
-    dfcx_results = ingest_dfcx_prompts()
+def ingest_all(registry: Optional[PromptRegistry] = None):
+    bar = "=" * 60
+    print(f"{bar}\n  VERTEX AI PROMPT MANAGEMENT - BULK INGESTION\n{bar}")
 
-    print("\n[2/3] Ingesting ADK prompts...")
-    adk_results = ingest_adk_prompts()
+    # Extraction is independent per source (real DFCX/ADK APIs would be I/O bound)
+    print("\n[1/2] Extracting prompts from DFCX, ADK and Custom agents...")
+    with ThreadPoolExecutor(max_workers=len(_SOURCES)) as executor:
+        futures = [executor.submit(extract) for _, extract in _SOURCES]
+        batches = [future.result() for future in futures]
 
-    print("\n[3/3] Ingesting Custom agent prompts...")
-    custom_results = ingest_custom_prompts()
+    print("\n".join(
+        f"  [{agent_type.upper()}] Extracted {len(batch)} prompt(s)"
+        for (agent_type, _), batch in zip(_SOURCES, batches)
+    ))
 
-    total = len(dfcx_results) + len(adk_results) + len(custom_results)
+    # Single registry load + single save for all sources
+    print("\n[2/2] Writing prompts to registry...")
+    if registry is None:
+        registry = PromptRegistry()
+    created = registry.create_prompts_bulk(p for batch in batches for p in batch)
 
-    print("\n" + "=" * 60)
-    print(f"  INGESTION COMPLETE - Total prompts ingested: {total}")
-    print("=" * 60)
+    # Build the whole summary and emit it with one write
+    lines = []
+    for agent_type, _ in _SOURCES:
+        ingested = [p["prompt_id"] for p in created if p["agent_type"] == agent_type]
+        lines.append(f"\n[{agent_type.upper()}] Ingested {len(ingested)} prompt(s): {ingested}")
+    lines += [
+        "\n" + bar,
+        f"  INGESTION COMPLETE - Total prompts ingested: {len(created)}",
+        bar,
+    ]
+    print("\n".join(lines))
 
 
 if __name__ == "__main__":
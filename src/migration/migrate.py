@@ -4,16 +4,28 @@
 # Creates new prompt entries with environment suffix in ID
 # Supports dry-run mode and generates migration manifest
 
+import os
+import re
 import sys
-import json
-import copy
+from collections import deque
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import Optional
 
-sys.path.append(str(Path(__file__).parent.parent.parent))
+if __name__ == "__main__":
+    # Direct script run - make the project root importable.
+    # Prefer package-style runs instead: python -m src.migration.migrate
+    sys.path.append(str(Path(__file__).parent.parent.parent))
 
 import config
 from src.registry.store import PromptRegistry
+from src.utils import jsonio
+
+
+# Matches a trailing environment suffix such as "_dev" or "_staging"
+_ENV_SUFFIX_RE = re.compile(
+    r"_(?:" + "|".join(map(re.escape, config.ENVIRONMENTS)) + r")\Z"
+)
 
 
 class MigrationEngine:
@@ -25,26 +37,80 @@ class MigrationEngine:
     - Example: dfcx_billing_payment_query_dev → dfcx_billing_payment_query_qa
     - Never overwrites - always creates new or adds version
     - Full audit trail via migration manifest
+
+    Use as a context manager to batch many migrations - their manifest
+    lines are then appended in one write on exit:
+
+        with MigrationEngine() as engine:
+            engine.migrate("..._dev")
+            engine.migrate("..._qa")
     """
 
-    def __init__(self):
-        self.registry = PromptRegistry()
+    def __init__(self, registry: Optional[PromptRegistry] = None):
+        # Pass a shared registry to reuse its already-parsed data
+        self.registry = registry if registry is not None else PromptRegistry()
         self.manifest_file = config.MANIFEST_FILE
+        self._manifest_path = config.MANIFEST_FILE_STR
+        self._pending = []              # manifest entries not yet appended
+        self._batch = False             # inside `with`: defer manifest writes
+        self._legacy_checked = False    # legacy .json looked at yet?
 
-    # ─── Helpers ─────────────────────────────────────────────────────────────
+    def __enter__(self):
+        self._batch = True
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._batch = False
+        self._flush_manifest()
+        return False
 
-    def _load_manifest(self) -> dict:
-        if self.manifest_file.exists():
-            with open(self.manifest_file, "r") as f:
-                return json.load(f)
-        return {"migrations": []}
+    # ─── Helpers ─────────────────────────────────────────────────────────────
 
-    def _save_manifest(self, manifest: dict):
-        with open(self.manifest_file, "w") as f:
-            json.dump(manifest, f, indent=2, default=str)
+    def _upgrade_legacy_manifest(self):
+        """
+        Convert an old migration_manifest.json to JSONL on first manifest
+        access. The legacy file is left untouched; once the JSONL file
+        exists it takes precedence and the legacy file is ignored.
+        """
+        if self._legacy_checked:
+            return
+        self._legacy_checked = True
+        legacy = config.LEGACY_MANIFEST_FILE
+        if os.path.exists(self._manifest_path) or not legacy.exists():
+            return
+        with open(legacy, "rb") as f:
+            entries = jsonio.loads(f.read()).get("migrations", [])
+        jsonio.write_atomic(self._manifest_path, jsonio.dumps_lines(entries))
+
+    def _load_manifest(self):
+        """Yield manifest entries oldest first, streaming line by line."""
+        self._upgrade_legacy_manifest()
+        if os.path.exists(self._manifest_path):
+            with open(self._manifest_path, "rb") as f:
+                for line in f:
+                    if line.strip():
+                        yield jsonio.loads(line)
+        # Entries still held back by an open `with` block
+        yield from self._pending
+
+    def _append_manifest(self, entry: dict):
+        """Append one entry - O(1), the existing history is never rewritten."""
+        self._pending.append(entry)
+        if not self._batch:
+            self._flush_manifest()
+
+    def _flush_manifest(self):
+        """Append all pending entries with a single write()."""
+        if not self._pending:
+            return
+        self._upgrade_legacy_manifest()
+        with open(self._manifest_path, "ab") as f:
+            f.write(jsonio.dumps_lines(self._pending))
+        self._pending = []
 
-    def _timestamp(self) -> str:
-        return f"{datetime.utcnow().isoformat()}Z"
+    def _timestamp(self, now: Optional[datetime] = None) -> str:
+        now = now or datetime.now(timezone.utc)
+        return now.strftime("%Y-%m-%dT%H:%M:%SZ")
 
     def _build_env_prompt_id(self, base_prompt_id: str, environment: str) -> str:
         """
@@ -53,18 +119,11 @@ class MigrationEngine:
               → dfcx_billing_payment_query_qa
         """
         # Remove existing env suffix if present
-        for env in config.ENVIRONMENTS:
-            if base_prompt_id.endswith(f"_{env}"):
-                base_prompt_id = base_prompt_id[: -(len(env) + 1)]
-                break
-        return f"{base_prompt_id}_{environment}"
+        return f"{_ENV_SUFFIX_RE.sub('', base_prompt_id, count=1)}_{environment}"
 
     def _get_base_prompt_id(self, prompt_id: str) -> str:
         """Strip environment suffix from prompt ID."""
-        for env in config.ENVIRONMENTS:
-            if prompt_id.endswith(f"_{env}"):
-                return prompt_id[: -(len(env) + 1)]
-        return prompt_id
+        return _ENV_SUFFIX_RE.sub("", prompt_id, count=1)
 
     # ─── Core Migration ───────────────────────────────────────────────────────
 
@@ -80,19 +139,15 @@ class MigrationEngine:
             Migration manifest entry dict
         """
         # Step 1: Load source prompt
-        data = self.registry._load()
-        all_ids = list(data["prompts"].keys())
-
         # Find the prompt (handle with/without env suffix)
         resolved_id = None
-        if prompt_id in all_ids:
+        if self.registry.has_prompt(prompt_id):
             resolved_id = prompt_id
         else:
-            # Try matching base ID
-            for pid in all_ids:
-                if self._get_base_prompt_id(pid) == self._get_base_prompt_id(prompt_id):
-                    resolved_id = pid
-                    break
+            # Try matching base ID - first env copy in registry order
+            candidates = self.registry.ids_by_base(self._get_base_prompt_id(prompt_id))
+            if candidates:
+                resolved_id = candidates[0]
 
         if resolved_id is None:
             raise KeyError(f"Prompt '{prompt_id}' not found in registry.")
@@ -123,11 +178,12 @@ class MigrationEngine:
         print(f"  Dry Run          : {dry_run}")
         print(f"{'=' * 60}")
 
-        # Step 4: Build manifest entry
+        # Step 4: Build manifest entry - ID and timestamp share one clock read
+        now = datetime.now(timezone.utc)
         manifest_entry = {
             "migration_id":   (
                 f"mig_{base_id}_{source_env}_to_{target_env}_"
-                f"{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
+                f"{now.strftime('%Y%m%d%H%M%S')}"
             ),
             "source_prompt_id":  resolved_id,
             "target_prompt_id":  target_prompt_id,
@@ -136,7 +192,7 @@ class MigrationEngine:
             "source_version":    source_version,
             "target_version":    None,
             "operator":          config.OPERATOR,
-            "timestamp":         self._timestamp(),
+            "timestamp":         self._timestamp(now),
             "dry_run":           dry_run,
             "status":            "pending"
         }
@@ -150,12 +206,7 @@ class MigrationEngine:
             return manifest_entry
 
         # Step 6: Check if target already exists
-        existing_in_target = [
-            p["prompt_id"]
-            for p in self.registry.list_prompts(environment=target_env)
-        ]
-
-        if target_prompt_id in existing_in_target:
+        if self.registry.has_prompt(target_prompt_id, environment=target_env):
             # Add new version to existing target prompt
             print(f"\n  Prompt exists in '{target_env}' - adding new version...")
             updated = self.registry.update_prompt(
@@ -175,13 +226,16 @@ class MigrationEngine:
                 environment=target_env,
                 system_instructions=version_content["system_instructions"],
                 template=version_content["template"],
-                model_parameters=copy.deepcopy(source_prompt["model_parameters"]),
+                model_parameters={**source_prompt["model_parameters"]},
                 metadata={
                     **source_prompt.get("metadata", {}),
                     "promoted_from":         source_env,
                     "promoted_from_version": source_version,
                     "promoted_by":           config.OPERATOR
-                }
+                },
+                # Source values were validated on creation; target_env
+                # comes from config.ENVIRONMENT_TRANSITIONS
+                validate=False
             )
             target_version = created["current_version"]
 
@@ -189,42 +243,55 @@ class MigrationEngine:
         manifest_entry["target_version"] = target_version
         manifest_entry["status"] = "success"
 
-        manifest = self._load_manifest()
-        manifest["migrations"].append(manifest_entry)
-        self._save_manifest(manifest)
+        self._append_manifest(manifest_entry)
 
         print(f"\n  [SUCCESS] Migrated to '{target_env}' → {target_prompt_id} (v{target_version})")
         self._print_manifest(manifest_entry)
         return manifest_entry
 
     def _print_manifest(self, entry: dict):
-        print(f"\n  --- MIGRATION MANIFEST ENTRY ---")
-        print(f"  Migration ID  : {entry['migration_id']}")
-        print(f"  Source        : {entry['source_prompt_id']} ({entry['source_env']} v{entry['source_version']})")
-        print(f"  Target        : {entry['target_prompt_id']} ({entry['target_env']} v{entry.get('target_version', 'N/A')})")
-        print(f"  Operator      : {entry['operator']}")
-        print(f"  Timestamp     : {entry['timestamp']}")
-        print(f"  Status        : {entry['status']}")
-        print(f"  --------------------------------")
-
-    def show_manifest(self):
-        """Display full migration history."""
-        manifest = self._load_manifest()
-        migrations = manifest.get("migrations", [])
-
-        if not migrations:
+        sys.stdout.write(
+            f"\n  --- MIGRATION MANIFEST ENTRY ---\n"
+            f"  Migration ID  : {entry['migration_id']}\n"
+            f"  Source        : {entry['source_prompt_id']} ({entry['source_env']} v{entry['source_version']})\n"
+            f"  Target        : {entry['target_prompt_id']} ({entry['target_env']} v{entry.get('target_version', 'N/A')})\n"
+            f"  Operator      : {entry['operator']}\n"
+            f"  Timestamp     : {entry['timestamp']}\n"
+            f"  Status        : {entry['status']}\n"
+            f"  --------------------------------\n"
+        )
+
+    def show_manifest(self, page: int = 20):
+        """
+        Display the most recent `page` migrations (memory stays O(page)).
+        page <= 0 shows the full history.
+        """
+        # Keep (number, entry) pairs so the total falls out of the last one
+        recent = deque(
+            enumerate(self._load_manifest(), 1), maxlen=page if page > 0 else None
+        )
+
+        if not recent:
             print("\n[MANIFEST] No migrations recorded yet.")
             return
 
-        print(f"\n{'=' * 60}")
-        print(f"  MIGRATION HISTORY ({len(migrations)} migration(s))")
-        print(f"{'=' * 60}")
-        for i, entry in enumerate(migrations, 1):
-            print(f"\n  [{i}] {entry.get('source_prompt_id','?')} → {entry.get('target_prompt_id','?')}")
-            print(f"       {entry['source_env']} → {entry['target_env']}")
-            print(f"       Status   : {entry['status']}")
-            print(f"       Operator : {entry['operator']}")
-            print(f"       Time     : {entry['timestamp']}")
+        total = recent[-1][0]
+        shown = f", showing last {len(recent)}" if total > len(recent) else ""
+        lines = [
+            f"\n{'=' * 60}",
+            f"  MIGRATION HISTORY ({total} migration(s){shown})",
+            f"{'=' * 60}",
+        ]
+        lines += [
+            f"\n  [{i}] {entry.get('source_prompt_id','?')} → {entry.get('target_prompt_id','?')}\n"
+            f"       {entry['source_env']} → {entry['target_env']}\n"
+            f"       Status   : {entry['status']}\n"
+            f"       Operator : {entry['operator']}\n"
+            f"       Time     : {entry['timestamp']}"
+            for i, entry in recent
+        ]
+        # One write for the whole listing instead of five prints per entry
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":
@@ -245,29 +312,36 @@ if __name__ == "__main__":
     parser.add_argument(
         "--history", 
         action="store_true", 
-        help="Show the full migration manifest history"
+        help="Show the migration manifest history (last --page entries)"
+    )
+    parser.add_argument(
+        "--page",
+        type=int,
+        default=20,
+        help="Number of most recent entries --history shows (0 = all, default 20)"
     )
 
     args = parser.parse_args()
-    engine = MigrationEngine()
 
-    # Agar user ne --history flag pass kiya hai
-    if args.history:
-        engine.show_manifest()
+    # Batch mode: manifest changes are written once when the block exits
+    with MigrationEngine() as engine:
+        # Agar user ne --history flag pass kiya hai
+        if args.history:
+            engine.show_manifest(page=args.page)
     
-    # Agar user ne --id pass kiya hai
-    elif args.id:
-        if args.dry_run:
-            print(f"\n>>> [DRY RUN MODE] Initiating migration for: {args.id}")
-        else:
-            print(f"\n>>> [LIVE MODE] Initiating migration for: {args.id}")
+        # Agar user ne --id pass kiya hai
+        elif args.id:
+            if args.dry_run:
+                print(f"\n>>> [DRY RUN MODE] Initiating migration for: {args.id}")
+            else:
+                print(f"\n>>> [LIVE MODE] Initiating migration for: {args.id}")
             
-        try:
-            engine.migrate(prompt_id=args.id, dry_run=args.dry_run)
-        except Exception as e:
-            print(f"\n❌ MIGRATION FAILED: {str(e)}")
+            try:
+                engine.migrate(prompt_id=args.id, dry_run=args.dry_run)
+            except Exception as e:
+                print(f"\n❌ MIGRATION FAILED: {str(e)}")
             
-    else:
-        # Agar user bina kisi flag ke script chalaye
-        print("Please provide a prompt ID using --id or view history using --history.")
-        print("Example: python migrate.py --id custom_account_update_handler_dev")
\ No newline at end of file
+        else:
+            # Agar user bina kisi flag ke script chalaye
+            print("Please provide a prompt ID using --id or view history using --history.")
+            print("Example: python migrate.py --id custom_account_update_handler_dev")
\ No newline at end of file
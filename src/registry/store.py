@@ -2,15 +2,78 @@
 # Core Prompt Registry - Local simulation of Vertex AI Prompt Management
 # Handles: CREATE, READ, UPDATE, DELETE, VERSION HISTORY, ROLLBACK
 
-import json
+import mmap
+import os
+import sys
 import uuid
-from datetime import datetime
-from pathlib import Path
-from typing import Optional
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Iterable, Optional
 
-import sys
-sys.path.append(str(Path(__file__).parent.parent.parent))
 import config
+from src.utils import jsonio
+
+# Keys every source prompt passed to create_prompts_bulk() must carry
+_REQUIRED_FIELDS = (
+    "name", "domain", "agent_type", "environment", "system_instructions", "template"
+)
+
+
+# Short values repeated across every prompt, interned after each parse
+_INTERNED_FIELDS = ("domain", "agent_type", "environment")
+
+
+def _intern_strings(data: dict) -> dict:
+    """
+    Make every prompt share one str object per repeated value
+    (domain, agent_type, environment, model, extracted_by, created_by).
+    The allowed values are identifier-like literals in config.py, which
+    Python already interns, so they resolve to those same objects.
+    """
+    intern = sys.intern
+    for prompt in data["prompts"].values():
+        for field in _INTERNED_FIELDS:
+            prompt[field] = intern(prompt[field])
+        params = prompt.get("model_parameters") or {}
+        if isinstance(params.get("model"), str):
+            params["model"] = intern(params["model"])
+        metadata = prompt.get("metadata") or {}
+        if isinstance(metadata.get("extracted_by"), str):
+            metadata["extracted_by"] = intern(metadata["extracted_by"])
+        for version in prompt["versions"].values():
+            version["created_by"] = intern(version["created_by"])
+    return data
+
+
+def _parse_registry(path: str) -> dict:
+    """
+    Parse the registry file into a fresh dict.
+    The file is memory-mapped and parsed straight from the mapping,
+    skipping the intermediate bytes copy of f.read().
+    """
+    with open(path, "rb") as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as view:
+            return _intern_strings(jsonio.loads(view))
+
+
+# path → revision key of the most recent _load_registry_cached() parse,
+# i.e. a revision that is known to be in the cache
+_CACHED_REVISION = {}
+
+
+@lru_cache(maxsize=4)
+def _load_registry_cached(path: str, mtime_ns: int, size: int, ino: int) -> dict:
+    """
+    Parse the registry file once per on-disk revision.
+    Keyed on mtime + size + inode; every save goes through os.replace(),
+    which gives the file a new inode, so rewrites miss the cache even
+    within one mtime tick. The returned dict is shared - callers must
+    not mutate it.
+    """
+    data = _parse_registry(path)
+    _CACHED_REVISION[path] = (mtime_ns, size, ino)
+    return data
 
 
 class PromptRegistry:
@@ -21,22 +84,125 @@ class PromptRegistry:
 
     def __init__(self):
         self.registry_file = config.REGISTRY_FILE
+        self._registry_path = config.REGISTRY_FILE_STR
+        self._data = None       # private, mutable copy used by write paths
+        self._data_key = None   # _stat_key() of the file _data matches
+        self._dirty = False     # _data has changes not yet written to disk
+        # Secondary indexes: value → {prompt_id: None}, a dict used as an
+        # insertion-ordered set (O(1) membership, registry order on iteration).
+        # Built lazily for whichever registry dict _index_src points to.
+        self._index_src = None
+        self._by_domain = {}
+        self._by_env = {}
+        self._by_base = {}      # prompt_id without env suffix → env copies
+        # get_prompt() results keyed by (prompt_id, current_version); reset
+        # whenever the registry dict it was built from is replaced
+        self._flat_src = None
+        self._flat_cache = {}
         self._ensure_registry_exists()
 
     def _ensure_registry_exists(self):
         """Create empty registry file if it does not exist."""
-        if not self.registry_file.exists():
+        if not os.path.exists(self._registry_path):
             self._save({"prompts": {}})
 
+    def _stat_key(self) -> tuple:
+        """Return (mtime_ns, size, inode) identifying the current file revision."""
+        st = os.stat(self._registry_path)
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def _load_readonly(self) -> dict:
+        """Load registry for read-only use. Do NOT mutate the result."""
+        if self._dirty:
+            return self._data
+        key = self._stat_key()
+        if self._data is not None and self._data_key == key:
+            return self._data
+        return _load_registry_cached(self._registry_path, *key)
+
     def _load(self) -> dict:
-        """Load registry from JSON file."""
-        with open(self.registry_file, "r") as f:
-            return json.load(f)
+        """Load registry for modification (private copy, re-read if file changed)."""
+        if self._dirty:
+            return self._data  # never drop unsaved changes
+        key = self._stat_key()
+        if self._data is None or self._data_key != key:
+            # Re-parse rather than deepcopy the shared cached dict -
+            # a fresh parse is several times cheaper than copy.deepcopy
+            self._data = _parse_registry(self._registry_path)
+            self._data_key = key
+        return self._data
 
     def _save(self, data: dict):
-        """Save registry to JSON file with pretty formatting."""
-        with open(self.registry_file, "w") as f:
-            json.dump(data, f, indent=2, default=str)
+        """Save registry to JSON file with pretty formatting (atomic replace)."""
+        jsonio.write_atomic(self._registry_path, jsonio.dumps(data))
+        self._data = data
+        self._data_key = self._stat_key()
+        self._dirty = False
+
+    def flush(self):
+        """
+        Write pending in-memory changes to disk (no-op when nothing changed).
+        If the write fails the unsaved changes are dropped, so the next read
+        reloads what is really on disk instead of serving phantom records.
+        """
+        if self._dirty:
+            try:
+                self._save(self._data)
+            except BaseException:
+                self._data = None
+                self._data_key = None
+                self._dirty = False
+                raise
+
+    @staticmethod
+    def _base_id(prompt: dict) -> str:
+        """Prompt ID with its `_{environment}` suffix removed."""
+        prompt_id, suffix = prompt["prompt_id"], f"_{prompt['environment']}"
+        if prompt_id.endswith(suffix):
+            return prompt_id[: -len(suffix)]
+        return prompt_id
+
+    def _build_indexes(self, data: dict):
+        """Build all secondary indexes (incl. base ID) in one pass."""
+        by_domain, by_env, by_base = {}, {}, {}
+        for prompt_id, prompt in data["prompts"].items():
+            by_domain.setdefault(prompt["domain"], {})[prompt_id] = None
+            by_env.setdefault(prompt["environment"], {})[prompt_id] = None
+            by_base.setdefault(self._base_id(prompt), {})[prompt_id] = None
+        self._by_domain = by_domain
+        self._by_env = by_env
+        self._by_base = by_base
+        self._index_src = data
+
+    def _load_indexed(self) -> dict:
+        """Load registry read-only and make sure indexes match it."""
+        data = self._load_readonly()
+        if data is not self._index_src:
+            self._build_indexes(data)
+        return data
+
+    def _index_add(self, data: dict, prompt: dict):
+        """Keep indexes current after a prompt is added to `data`."""
+        if data is self._index_src:
+            prompt_id = prompt["prompt_id"]
+            self._by_domain.setdefault(prompt["domain"], {})[prompt_id] = None
+            self._by_env.setdefault(prompt["environment"], {})[prompt_id] = None
+            self._by_base.setdefault(self._base_id(prompt), {})[prompt_id] = None
+
+    def ids_by_base(self, base_prompt_id: str) -> list:
+        """
+        Return IDs of every environment copy of a prompt, in registry order.
+        Example: dfcx_billing_payment_query → [..._dev, ..._qa]
+        """
+        self._load_indexed()
+        return list(self._by_base.get(base_prompt_id, ()))
+
+    def has_prompt(self, prompt_id: str, environment: Optional[str] = None) -> bool:
+        """O(1) check whether a prompt exists (optionally in a given environment)."""
+        prompts = self._load_indexed()["prompts"]
+        if environment:
+            return prompt_id in self._by_env.get(environment, ())
+        return prompt_id in prompts
 
     def _generate_prompt_id(
         self, name: str, domain: str, agent_type: str, environment: str = ""
@@ -51,24 +217,40 @@ class PromptRegistry:
             return f"{agent_type}_{domain}_{name_slug}_{environment}"
         return f"{agent_type}_{domain}_{name_slug}"
 
+    @staticmethod
+    def _param_overrides(model_parameters: dict) -> dict:
+        """Keep only the parameters that differ from config.DEFAULT_MODEL_PARAMS."""
+        defaults = config.DEFAULT_MODEL_PARAMS
+        return {
+            k: v for k, v in model_parameters.items()
+            if k not in defaults or defaults[k] != v
+        }
+
+    @staticmethod
+    def resolve_params(overrides: dict) -> dict:
+        """Full model parameters: defaults with the stored overrides applied."""
+        return {**config.DEFAULT_MODEL_PARAMS, **overrides}
+
+    def _resolved(self, prompt: dict) -> dict:
+        """Shallow copy of a stored record with model_parameters resolved."""
+        return {**prompt, "model_parameters": self.resolve_params(prompt["model_parameters"])}
+
     def _timestamp(self) -> str:
-        """Return current UTC timestamp in ISO format."""
-        return datetime.utcnow().isoformat() + "Z"
+        """Return current UTC timestamp in ISO format (second precision)."""
+        return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
     def _validate(self, domain: str, agent_type: str, environment: str):
-        """Validate domain, agent_type, and environment against allowed values."""
-        errors = []
-        if domain not in config.DOMAINS:
-            errors.append(f"Invalid domain '{domain}'. Allowed: {config.DOMAINS}")
-        if agent_type not in config.AGENT_TYPES:
-            errors.append(f"Invalid agent_type '{agent_type}'. Allowed: {config.AGENT_TYPES}")
-        if environment not in config.ENVIRONMENTS:
-            errors.append(f"Invalid environment '{environment}'. Allowed: {config.ENVIRONMENTS}")
-        if errors:
-            raise ValueError("\n".join(errors))
-
-    def create_prompt(
+        """Validate domain, agent_type, and environment (raises on the first bad one)."""
+        if domain not in config.DOMAINS_SET:
+            raise ValueError(f"Invalid domain '{domain}'. Allowed: {config.DOMAINS}")
+        if agent_type not in config.AGENT_TYPES_SET:
+            raise ValueError(f"Invalid agent_type '{agent_type}'. Allowed: {config.AGENT_TYPES}")
+        if environment not in config.ENVIRONMENTS_SET:
+            raise ValueError(f"Invalid environment '{environment}'. Allowed: {config.ENVIRONMENTS}")
+
+    def _build_prompt(
         self,
+        prompt_id: str,
         name: str,
         domain: str,
         agent_type: str,
@@ -76,23 +258,13 @@ class PromptRegistry:
         system_instructions: str,
         template: str,
         model_parameters: Optional[dict] = None,
-        metadata: Optional[dict] = None
+        metadata: Optional[dict] = None,
+        now: Optional[str] = None
     ) -> dict:
-        """Create a new prompt in the registry."""
-        self._validate(domain, agent_type, environment)
-
-        prompt_id = self._generate_prompt_id(name, domain, agent_type, environment)
-
-        data = self._load()
-
-        if prompt_id in data["prompts"]:
-            raise ValueError(
-                f"Prompt '{prompt_id}' already exists. "
-                f"Use update_prompt() to add a new version."
-            )
-
-        now = self._timestamp()
-        prompt = {
+        """Build a new prompt record at the initial version."""
+        if now is None:
+            now = self._timestamp()
+        return {
             "prompt_id":        prompt_id,
             "name":             name,
             "domain":           domain,
@@ -101,8 +273,10 @@ class PromptRegistry:
             "current_version":  config.INITIAL_VERSION,
             "created_at":       now,
             "updated_at":       now,
-            "model_parameters": model_parameters or config.DEFAULT_MODEL_PARAMS,
-            "metadata":         metadata or {},
+            # Only values that differ from config.DEFAULT_MODEL_PARAMS are stored
+            "model_parameters": self._param_overrides(model_parameters or {}),
+            # Copied so records never alias caller-owned dicts
+            "metadata":         dict(metadata or {}),
             "versions": {
                 str(config.INITIAL_VERSION): {
                     "version":             config.INITIAL_VERSION,
@@ -115,22 +289,130 @@ class PromptRegistry:
             }
         }
 
+    def create_prompt(
+        self,
+        name: str,
+        domain: str,
+        agent_type: str,
+        environment: str,
+        system_instructions: str,
+        template: str,
+        model_parameters: Optional[dict] = None,
+        metadata: Optional[dict] = None,
+        *,
+        validate: bool = True
+    ) -> dict:
+        """
+        Create a new prompt in the registry.
+        Pass validate=False only when the values are already known-valid
+        (e.g. copied from a stored prompt during migration).
+        """
+        if validate:
+            self._validate(domain, agent_type, environment)
+
+        prompt_id = self._generate_prompt_id(name, domain, agent_type, environment)
+
+        data = self._load()
+
+        if prompt_id in data["prompts"]:
+            raise ValueError(
+                f"Prompt '{prompt_id}' already exists. "
+                f"Use update_prompt() to add a new version."
+            )
+
+        prompt = self._build_prompt(
+            prompt_id,
+            name=name,
+            domain=domain,
+            agent_type=agent_type,
+            environment=environment,
+            system_instructions=system_instructions,
+            template=template,
+            model_parameters=model_parameters,
+            metadata=metadata
+        )
+
         data["prompts"][prompt_id] = prompt
-        self._save(data)
+        self._index_add(data, prompt)
+        self._dirty = True
+        self.flush()
 
         print(f"[CREATED] Prompt '{prompt_id}' (v{config.INITIAL_VERSION}) saved.")
-        return prompt
+        return self._resolved(prompt)
+
+    def create_prompts_bulk(self, prompts: Iterable[dict]) -> list:
+        """
+        Create many prompts with a single registry load and a single save.
+        Each item takes the same keys as create_prompt(); extra keys are
+        ignored. Malformed, invalid or already existing prompts are
+        skipped and reported, not raised.
+        """
+        data = self._load()
+        if data is not self._index_src:
+            self._build_indexes(data)
+        created = []
+        now = self._timestamp()  # one timestamp for the whole batch
+
+        for p in prompts:
+            missing = [k for k in _REQUIRED_FIELDS if k not in p]
+            if missing:
+                print(f"[SKIPPED] {p.get('name', '?')} - malformed: missing {missing}")
+                continue
+
+            try:
+                self._validate(p["domain"], p["agent_type"], p["environment"])
+            except ValueError as e:
+                print(f"[SKIPPED] {p['name']} - invalid: {e}")
+                continue
+
+            prompt_id = self._generate_prompt_id(
+                p["name"], p["domain"], p["agent_type"], p["environment"]
+            )
+            if prompt_id in data["prompts"]:
+                print(f"[SKIPPED] {p['name']} - already exists: '{prompt_id}'")
+                continue
+
+            prompt = self._build_prompt(
+                prompt_id,
+                name=p["name"],
+                domain=p["domain"],
+                agent_type=p["agent_type"],
+                environment=p["environment"],
+                system_instructions=p["system_instructions"],
+                template=p["template"],
+                model_parameters=p.get("model_parameters"),
+                metadata=p.get("metadata"),
+                now=now
+            )
+            data["prompts"][prompt_id] = prompt
+            self._index_add(data, prompt)
+            created.append(prompt)
+            print(f"[CREATED] Prompt '{prompt_id}' (v{config.INITIAL_VERSION}) staged.")
+
+        if created:
+            self._dirty = True
+            self.flush()
+            print(f"[SAVED] {len(created)} prompt(s) written to registry.")
+        return [self._resolved(p) for p in created]
 
     def get_prompt(self, prompt_id: str) -> dict:
         """Retrieve a prompt by its ID."""
-        data = self._load()
+        data = self._load_readonly()
         if prompt_id not in data["prompts"]:
             raise KeyError(f"Prompt '{prompt_id}' not found in registry.")
+        if data is not self._flat_src:
+            self._flat_cache = {}
+            self._flat_src = data
 
         prompt = data["prompts"][prompt_id]
-        current_v = str(prompt["current_version"])
-        result = {**prompt, **prompt["versions"][current_v]}
-        return result
+        key = (prompt_id, prompt["current_version"])
+        flat = self._flat_cache.get(key)
+        if flat is None:
+            flat = {**prompt, **prompt["versions"][str(key[1])]}
+            flat["model_parameters"] = self.resolve_params(prompt["model_parameters"])
+            self._flat_cache[key] = flat
+        # Shallow copy (with its own model_parameters) so callers can mutate
+        return {**flat, "model_parameters": dict(flat["model_parameters"])}
 
     def list_prompts(
         self,
@@ -138,20 +420,84 @@ class PromptRegistry:
         environment: Optional[str] = None,
         agent_type: Optional[str] = None
     ) -> list:
-        """List prompts with optional filters."""
-        data = self._load()
-        results = []
-
-        for prompt_id, prompt in data["prompts"].items():
-            if domain and prompt["domain"] != domain:
-                continue
-            if environment and prompt["environment"] != environment:
-                continue
-            if agent_type and prompt["agent_type"] != agent_type:
-                continue
-            results.append(prompt)
+        """
+        List prompts with optional filters. Domain/environment filters are
+        index lookups (no full scan); agent_type is checked per candidate.
+        Records come back with resolved model_parameters, like get_prompt().
+        """
+        prompts = self._load_indexed()["prompts"]
 
-        return results
+        buckets = []
+        if domain:
+            buckets.append(self._by_domain.get(domain, {}))
+        if environment:
+            buckets.append(self._by_env.get(environment, {}))
+        if not buckets:
+            candidates = prompts.values()
+        elif not all(buckets):
+            return []  # some filter value has no prompts at all
+        else:
+            # Walk the smallest bucket, probe the others - O(smallest bucket)
+            buckets.sort(key=len)
+            smallest, others = buckets[0], buckets[1:]
+            candidates = [
+                prompts[pid] for pid in smallest
+                if all(pid in other for other in others)
+            ]
+
+        if agent_type:
+            candidates = [p for p in candidates if p["agent_type"] == agent_type]
+        return [self._resolved(p) for p in candidates]
+
+    def iter_prompts_filtered(
+        self,
+        domain: Optional[str] = None,
+        environment: Optional[str] = None,
+        agent_type: Optional[str] = None
+    ):
+        """
+        Yield prompts matching the filters, same semantics as list_prompts().
+        Backs every filter in src/utils/filter.py. Normally this is
+        list_prompts(), which intersects the domain/environment/agent_type
+        index sets - no per-record scan. Only without orjson and with a cold
+        cache is the file streamed with ijson instead.
+        """
+        # Cheap negative check first: values _validate() would reject can
+        # never match a stored prompt, so skip loading/streaming entirely
+        if (
+            (domain and domain not in config.DOMAINS_SET)
+            or (environment and environment not in config.ENVIRONMENTS_SET)
+            or (agent_type and agent_type not in config.AGENT_TYPES_SET)
+        ):
+            return
+
+        key = self._stat_key()
+        if (
+            jsonio.HAS_ORJSON
+            or self._dirty
+            or self._data_key == key
+            or _CACHED_REVISION.get(self._registry_path) == key
+        ):
+            yield from self.list_prompts(domain, environment, agent_type)
+            return
+
+        # Imported here, not at module level: only this fallback needs it,
+        # and every other CLI command would pay for the import otherwise
+        try:
+            import ijson
+        except ImportError:  # optional dependency: pip install ijson
+            yield from self.list_prompts(domain, environment, agent_type)
+            return
+
+        with open(self._registry_path, "rb") as f:
+            for _, prompt in ijson.kvitems(f, "prompts", use_float=True):
+                if domain and prompt["domain"] != domain:
+                    continue
+                if environment and prompt["environment"] != environment:
+                    continue
+                if agent_type and prompt["agent_type"] != agent_type:
+                    continue
+                yield self._resolved(prompt)
 
     def update_prompt(
         self,
@@ -184,19 +530,22 @@ class PromptRegistry:
         prompt["updated_at"] = now
 
         if model_parameters:
-            prompt["model_parameters"] = model_parameters
+            prompt["model_parameters"] = self._param_overrides(model_parameters)
 
-        self._save(data)
+        self._dirty = True
+        self.flush()
         print(f"[UPDATED] Prompt '{prompt_id}' → v{new_version}")
-        return prompt
+        return self._resolved(prompt)
 
     def get_version_history(self, prompt_id: str) -> list:
         """Retrieve full version history for a prompt."""
-        data = self._load()
+        data = self._load_readonly()
         if prompt_id not in data["prompts"]:
             raise KeyError(f"Prompt '{prompt_id}' not found.")
 
         versions = data["prompts"][prompt_id]["versions"]
+        # Stored in version order already, so Timsort's already-sorted fast
+        # path makes this O(N); kept so a hand-edited file still sorts right
         history = sorted(versions.values(), key=lambda x: x["version"])
         return history
 
@@ -204,6 +553,8 @@ class PromptRegistry:
         """
         Rollback a prompt to a previous version.
         Creates a NEW version with old content - audit trail preserved.
+        Returns the prompt record plus "active_content" (the new version)
+        and "history" (all versions, oldest first) - no re-read needed.
         """
         data = self._load()
         if prompt_id not in data["prompts"]:
@@ -235,9 +586,14 @@ class PromptRegistry:
         prompt["current_version"] = new_version
         prompt["updated_at"] = now
 
-        self._save(data)
+        self._dirty = True
+        self.flush()
         print(
             f"[ROLLBACK] Prompt '{prompt_id}' "
             f"rolled back to v{target_version} content → now active as v{new_version}"
         )
-        return prompt
\ No newline at end of file
+        return {
+            **self._resolved(prompt),
+            "active_content": versions[str(new_version)],
+            "history":        sorted(versions.values(), key=lambda v: v["version"]),
+        }
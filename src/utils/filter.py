@@ -5,11 +5,18 @@
 
 import sys
 from pathlib import Path
-sys.path.append(str(Path(__file__).parent.parent.parent))
+
+if __name__ == "__main__":
+    # Direct script run - make the project root importable.
+    # Prefer package-style runs instead: python -m src.utils.filter
+    sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from src.registry.store import PromptRegistry
 from tabulate import tabulate
 
+# Column headers shared by every filter listing
+_TABLE_HEADERS = ("Prompt ID", "Domain", "Agent Type", "Environment", "Version")
+
 
 def display_prompts_table(prompts: list, title: str = ""):
     """
@@ -20,22 +27,23 @@ def display_prompts_table(prompts: list, title: str = ""):
         print(f"\n[FILTER] No prompts found for: {title}")
         return
 
-    table_data = []
-    for p in prompts:
-        table_data.append([
+    table_data = [
+        (
             p["prompt_id"],
             p["domain"],
             p["agent_type"],
             p["environment"],
             f"v{p['current_version']}",
-        ])
-
-    headers = ["Prompt ID", "Domain", "Agent Type", "Environment", "Version"]
-
-    print(f"\n{'=' * 70}")
-    print(f"  {title}  ({len(prompts)} result(s))")
-    print(f"{'=' * 70}")
-    print(tabulate(table_data, headers=headers, tablefmt="grid"))
+        )
+        for p in prompts
+    ]
+
+    rule = "=" * 70
+    # "simple" renders much faster than "grid" (no per-row borders)
+    table = tabulate(table_data, headers=_TABLE_HEADERS, tablefmt="simple")
+    sys.stdout.write(
+        f"\n{rule}\n  {title}  ({len(prompts)} result(s))\n{rule}\n{table}\n"
+    )
 
 
 def filter_by_domain(domain: str) -> list:
@@ -44,7 +52,7 @@ def filter_by_domain(domain: str) -> list:
     No prompts from other domains will appear (no cross-contamination).
     """
     registry = PromptRegistry()
-    results = registry.list_prompts(domain=domain)
+    results = list(registry.iter_prompts_filtered(domain=domain))
     display_prompts_table(results, f"Domain Filter: '{domain}'")
     return results
 
@@ -55,7 +63,7 @@ def filter_by_environment(environment: str) -> list:
     No prompts from other environments will appear (no cross-contamination).
     """
     registry = PromptRegistry()
-    results = registry.list_prompts(environment=environment)
+    results = list(registry.iter_prompts_filtered(environment=environment))
     display_prompts_table(results, f"Environment Filter: '{environment}'")
     return results
 
@@ -66,7 +74,9 @@ def filter_by_domain_and_environment(domain: str, environment: str) -> list:
     Most precise filter - used before migration to verify source prompts.
     """
     registry = PromptRegistry()
-    results = registry.list_prompts(domain=domain, environment=environment)
+    results = list(
+        registry.iter_prompts_filtered(domain=domain, environment=environment)
+    )
     display_prompts_table(
         results,
         f"Domain: '{domain}' + Environment: '{environment}'"
@@ -0,0 +1,54 @@
+# src/utils/jsonio.py
+# JSON (de)serialization and atomic file writes for the registry files
+# Uses orjson when it is installed (several times faster than stdlib json)
+# and falls back to stdlib json so the PoC keeps working without it
+
+import json
+import os
+
+try:
+    import orjson
+except ImportError:  # optional dependency: pip install orjson
+    orjson = None
+
+HAS_ORJSON = orjson is not None
+
+
+def loads(data):
+    """Parse JSON from bytes or any buffer (e.g. a memoryview of an mmap)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(bytes(data))
+
+
+def dumps(obj) -> bytes:
+    """Serialize to pretty-printed (2-space indented) JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2, default=str)
+    return json.dumps(obj, indent=2, default=str).encode("utf-8")
+
+
+def dumps_lines(objs) -> bytes:
+    """Serialize objects as JSON Lines - one compact document per line."""
+    if orjson is not None:
+        return b"".join(orjson.dumps(obj, default=str) + b"\n" for obj in objs)
+    return "".join(
+        json.dumps(obj, ensure_ascii=False, default=str) + "\n" for obj in objs
+    ).encode("utf-8")
+
+
+def write_atomic(path: str, payload: bytes):
+    """
+    Write payload with one write() to a temp file, then os.replace() it
+    over path - readers never see a half-written file.
+    """
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, path)
+    except BaseException:
+        # Never leave a partial temp file behind; the target is untouched
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
@@ -4,15 +4,21 @@
 
 import sys
 from pathlib import Path
-sys.path.append(str(Path(__file__).parent.parent.parent))
+from typing import Optional
+
+if __name__ == "__main__":
+    # Direct script run - make the project root importable.
+    # Prefer package-style runs instead: python -m src.utils.versioning
+    sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from src.registry.store import PromptRegistry
 from tabulate import tabulate
 
 
-def show_version_history(prompt_id: str):
+def show_version_history(prompt_id: str, registry: Optional[PromptRegistry] = None):
     """Display complete version history of a prompt."""
-    registry = PromptRegistry()
+    if registry is None:
+        registry = PromptRegistry()
     history = registry.get_version_history(prompt_id)
 
     print(f"\n{'=' * 65}")
@@ -39,9 +45,10 @@ def show_version_history(prompt_id: str):
     print(f"\n  >>> ACTIVE VERSION: v{prompt['current_version']} <<<")
 
 
-def add_new_version(prompt_id: str):
+def add_new_version(prompt_id: str, registry: Optional[PromptRegistry] = None):
     """Add a new version to demonstrate version history."""
-    registry = PromptRegistry()
+    if registry is None:
+        registry = PromptRegistry()
 
     print(f"\n[VERSIONING] Adding new version to '{prompt_id}'...")
     registry.update_prompt(
@@ -64,9 +71,12 @@ def add_new_version(prompt_id: str):
     )
 
 
-def rollback_demo(prompt_id: str, target_version: int):
+def rollback_demo(
+    prompt_id: str, target_version: int, registry: Optional[PromptRegistry] = None
+):
     """Demonstrate rollback to a previous version."""
-    registry = PromptRegistry()
+    if registry is None:
+        registry = PromptRegistry()
 
     print(f"\n{'=' * 65}")
     print(f"  ROLLBACK DEMO")
@@ -74,20 +84,20 @@ def rollback_demo(prompt_id: str, target_version: int):
     print(f"  Prompt   : {prompt_id}")
     print(f"  Rollback to: v{target_version}")
 
-    registry.rollback(prompt_id=prompt_id, target_version=target_version)
+    result = registry.rollback(prompt_id=prompt_id, target_version=target_version)
 
-    # Confirm rollback via API
+    # Confirm rollback from the returned record - no second registry read
     print(f"\n  [CONFIRMATION] Verifying rollback via registry...")
-    prompt = registry.get_prompt(prompt_id)
-    active_version = prompt["current_version"]
-    active_content = prompt["versions"][str(active_version)]
+    active_version = result["current_version"]
+    active_content = result["active_content"]
 
     print(f"  Active Version  : v{active_version}")
     print(f"  Change Note     : {active_content['change_note']}")
     print(f"  Content matches v{target_version}: ", end="")
 
-    original = registry.get_version_history(prompt_id)
-    original_content = next(v for v in original if v["version"] == target_version)
+    original_content = next(
+        v for v in result["history"] if v["version"] == target_version
+    )
 
     if (active_content["system_instructions"] ==
             original_content["system_instructions"]):